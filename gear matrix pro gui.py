@@ -4,6 +4,10 @@ from tkinter import ttk, messagebox, Toplevel, StringVar, Checkbutton, IntVar
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
+import numpy as np
+
+# Matplotlib 'fast' style: path simplification (threshold 1.0) and Agg chunking for cheaper redraws
+plt.style.use('fast')
 
 # Valid gear type connections (used for validating user input combinations)
 VALID_TRANSITIONS = {
@@ -23,6 +27,126 @@ UNIT_CONVERSIONS = {
     "torque": {"Nm": 1, "kgm": 9.80665, "lbf-ft": 1.35582, "lbf-in": 0.1129848}
 }
 
+# Dropdown values, built once at import instead of per widget
+_GEAR_TYPES = tuple(VALID_TRANSITIONS)
+_LENGTH_UNITS = tuple(UNIT_CONVERSIONS["length"])
+_TORQUE_UNITS = tuple(UNIT_CONVERSIONS["torque"])
+
+# Propagate RPM/Torque depth-first from gear 0 over a CSR adjacency (indptr, indices).
+# Fills rpm/torque/eff/reached in place, records each traversed edge in edge_from/edge_to
+# and returns the number of edges traversed.
+def propagate(indptr, indices, radius, rpm, torque, eff, reached, edge_from, edge_to):
+    n = radius.shape[0]
+    stack_node = np.empty(n, np.int64)
+    stack_pos = np.empty(n, np.int64)
+    stack_node[0] = 0
+    stack_pos[0] = indptr[0]
+    top = 1
+    m = 0
+    reached[0] = True
+    while top > 0:
+        node = stack_node[top - 1]
+        pos = stack_pos[top - 1]
+        if pos == indptr[node + 1]:
+            top -= 1
+            continue
+        stack_pos[top - 1] = pos + 1
+        nbr = indices[pos]
+        if nbr >= n:
+            raise IndexError("connection to a gear that does not exist")
+        if reached[nbr]:
+            continue
+        reached[nbr] = True
+        r1 = radius[node]
+        radius_ratio = radius[nbr] / r1 if r1 != 0.0 else 1.0
+        if radius_ratio == 0.0:
+            raise ZeroDivisionError("float division by zero")
+        rpm[nbr] = rpm[node] * radius_ratio
+        torque[nbr] = torque[node] / radius_ratio
+        input_power = torque[node] * rpm[node]
+        eff[nbr] = torque[nbr] * rpm[nbr] / input_power if input_power != 0.0 else 1.0
+        edge_from[m] = node
+        edge_to[m] = nbr
+        m += 1
+        stack_node[top] = nbr
+        stack_pos[top] = indptr[nbr]
+        top += 1
+    return m
+
+# Same traversal as propagate() on Python lists, for when Numba is unavailable;
+# per-element NumPy indexing in plain Python is slower than list access
+def _propagate_lists(indptr, indices, radius, rpm, torque, eff, reached, edge_from, edge_to):
+    n = len(radius)
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    radius_l = radius.tolist()
+    rpm_l = rpm.tolist()
+    torque_l = torque.tolist()
+    eff_l = eff.tolist()
+    reached_l = reached.tolist()
+    edges = []
+    reached_l[0] = True
+    stack = [(0, iter(indices[indptr[0]:indptr[1]]))]
+    while stack:
+        node, nbrs = stack[-1]
+        nbr = next(nbrs, None)
+        if nbr is None:
+            stack.pop()
+            continue
+        if nbr >= n:
+            raise IndexError("connection to a gear that does not exist")
+        if reached_l[nbr]:
+            continue
+        reached_l[nbr] = True
+        r1 = radius_l[node]
+        radius_ratio = radius_l[nbr] / r1 if r1 != 0.0 else 1.0
+        if radius_ratio == 0.0:
+            raise ZeroDivisionError("float division by zero")
+        rpm_l[nbr] = rpm_l[node] * radius_ratio
+        torque_l[nbr] = torque_l[node] / radius_ratio
+        input_power = torque_l[node] * rpm_l[node]
+        eff_l[nbr] = torque_l[nbr] * rpm_l[nbr] / input_power if input_power != 0.0 else 1.0
+        edges.append((node, nbr))
+        stack.append((nbr, iter(indices[indptr[nbr]:indptr[nbr + 1]])))
+    rpm[:] = rpm_l
+    torque[:] = torque_l
+    eff[:] = eff_l
+    reached[:] = reached_l
+    m = len(edges)
+    if m:
+        edge_from[:m], edge_to[:m] = zip(*edges)
+    return m
+
+# Numba is optional and only imported the first time a branched gear graph is calculated,
+# so it doesn't slow down startup; without it (or if it can't be set up) the list version is used
+_propagate_kernel = None
+
+def _get_propagate_kernel():
+    global _propagate_kernel
+    if _propagate_kernel is None:
+        try:
+            from numba import njit
+            _propagate_kernel = njit(cache=True)(propagate)
+        except Exception:
+            # Not installed, or no usable cache location next to the script
+            _propagate_kernel = _propagate_lists
+    return _propagate_kernel
+
+# Run the propagation kernel, dropping to the list version for good if the JIT compile fails
+def _run_propagate(*args):
+    global _propagate_kernel
+    kernel = _get_propagate_kernel()
+    if kernel is _propagate_lists:
+        return kernel(*args)
+    try:
+        return kernel(*args)
+    except (IndexError, ZeroDivisionError):
+        raise
+    except Exception:
+        # Numba typing/lowering errors are raised on the first call, before anything is written
+        _propagate_kernel = _propagate_lists
+        return _propagate_lists(*args)
+
 # Main class to build the GearMatrix Pro GUI and logic
 class GearMatrixPro:
     def __init__(self, root):
@@ -36,6 +160,20 @@ class GearMatrixPro:
         self.unit_label_var = tk.StringVar(value="Radius (mm)")
         self.unit_var.trace_add("write", self.update_unit_label)
         self.lines = []
+        self.gear_arrays = {}  # per-gear teeth/radius/rpm/torque/eff/module arrays from the last calculate
+
+        # Connections popup, created lazily and reused
+        self._popup = None
+        self._popup_check_frame = None
+        self._popup_checks = []
+        self._popup_target = None
+
+        # Cached conversion factors, refreshed only when a unit dropdown changes
+        self._length_factor = 1.0
+        self._torque_factor = 1.0
+        self._inv_torque_factor = 1.0
+        self.unit_var.trace_add("write", self._refresh_length_factor)
+        self.torque_unit_var.trace_add("write", self._refresh_torque_factor)
 
         # LEFT FRAME: For input fields
         self.left_frame = tk.Frame(self.root, bg="#111d40", padx=12, pady=12)
@@ -47,9 +185,9 @@ class GearMatrixPro:
         unit_frame = tk.Frame(self.left_frame, bg="#111d40")
         unit_frame.pack(pady=5)
         tk.Label(unit_frame, text="Length Unit:", fg="#00ccff", bg="#111d40").pack(side="left")
-        ttk.Combobox(unit_frame, values=list(UNIT_CONVERSIONS["length"].keys()), state="readonly", width=6, textvariable=self.unit_var).pack(side="left", padx=(5, 15))
+        ttk.Combobox(unit_frame, values=_LENGTH_UNITS, state="readonly", width=6, textvariable=self.unit_var).pack(side="left", padx=(5, 15))
         tk.Label(unit_frame, text="Torque Unit:", fg="#00ccff", bg="#111d40").pack(side="left")
-        ttk.Combobox(unit_frame, values=list(UNIT_CONVERSIONS["torque"].keys()), state="readonly", width=7, textvariable=self.torque_unit_var).pack(side="left")
+        ttk.Combobox(unit_frame, values=_TORQUE_UNITS, state="readonly", width=7, textvariable=self.torque_unit_var).pack(side="left")
 
         # Input header: Gear type, teeth, radius, connections
         self.input_frame = tk.Frame(self.left_frame, bg="#111d40")
@@ -88,7 +226,29 @@ class GearMatrixPro:
         self.result_label = tk.Label(self.right_frame, text="Results will appear here...", fg="#00ffaa", bg="#000c1c", font=("Courier New", 10), justify="left")
         self.result_label.pack(anchor="nw", fill="x", pady=10)
 
-        # Matplotlib Figure setup
+        # Chart state; the Matplotlib figure itself is built once the window has painted
+        self.canvas = None
+        self._bg = None  # background cache for blitting the animated RPM/Torque lines
+        self._plot_sig = None  # the last plotted stages/RPM/torque data and torque unit
+        self._hover_cid = None  # motion_notify_event is only connected while lines are plotted
+        self._annot_state = (None, None, None)  # (x, y, label) the annotation currently shows
+        self._hover_radius = 5  # pixel distance within which a point counts as hovered
+        self._stages_np = self._rpms_np = self._torques_np = np.empty(0)
+        self._last_event = None
+        # Tk drains pending idle callbacks before mapping the window, so wait for <Map>
+        self._map_bind_id = self.right_frame.bind("<Map>", self._on_first_map, add="+")
+
+    # Build the chart once the results pane is mapped, so the window paints first
+    def _on_first_map(self, event):
+        if self._map_bind_id is not None:
+            self.right_frame.unbind("<Map>", self._map_bind_id)
+            self._map_bind_id = None
+            self.root.after_idle(self._build_chart)
+
+    # Matplotlib Figure setup (deferred from __init__ until the window has been mapped)
+    def _build_chart(self):
+        if self.canvas is not None:
+            return
         self.fig = Figure(figsize=(5, 3), dpi=100, facecolor="#111111")
         self.ax = self.fig.add_subplot(111)
         self.ax.set_facecolor("#111111")
@@ -97,56 +257,99 @@ class GearMatrixPro:
         self.ax.yaxis.label.set_color("white")
         self.ax.title.set_color("white")
         self.ax.grid(True, color="#333333")
+        self.ax.set_title('Gearwise RPM & Torque')
+        self.ax.set_xlabel('Gear Index')
+        self.ax.set_ylabel('Values')
+
+        # RPM/Torque lines are created once and only have their data updated; they are
+        # animated so recomputes can blit them over the cached background. The legend and
+        # tooltip are animated too so they are painted after, and stay on top of, the lines
+        self.line1, = self.ax.plot([], [], marker='o', label='RPM', color='cyan', animated=True)
+        self.line2, = self.ax.plot([], [], marker='s', label='Torque (Nm)', color='magenta', animated=True)
+        self.ax.legend().set_animated(True)
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.right_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
 
         # Hover tooltip for graph points
         self.annot = self.ax.annotate("", xy=(0,0), xytext=(15,15), textcoords="offset points",
                                       bbox=dict(boxstyle="round", fc="#222", ec="white"),
-                                      color="white", fontsize=9)
+                                      color="white", fontsize=9, animated=True)
         self.annot.set_visible(False)
-        self.canvas.mpl_connect("motion_notify_event", self.hover)
+
+        # Single-shot timer so the hover hit-test only runs once the mouse settles
+        self._hover_timer = self.canvas.new_timer(interval=50)
+        self._hover_timer.single_shot = True
+        self._hover_timer.add_callback(self._do_hover)
 
     # Update label dynamically when unit is changed
     def update_unit_label(self, *args):
         self.unit_label_var.set(f"Radius ({self.unit_var.get()})")
 
+    # Refresh cached conversion factors when the selected unit changes
+    def _refresh_length_factor(self, *args):
+        self._length_factor = UNIT_CONVERSIONS["length"][self.unit_var.get()]
+
+    def _refresh_torque_factor(self, *args):
+        self._torque_factor = UNIT_CONVERSIONS["torque"][self.torque_unit_var.get()]
+        self._inv_torque_factor = 1.0 / self._torque_factor
+
     # Unit conversion helpers
     def convert_unit_length(self, value):
-        return float(value) * UNIT_CONVERSIONS["length"][self.unit_var.get()]
+        return float(value) * self._length_factor
 
     def convert_unit_torque(self, value):
-        return float(value) * UNIT_CONVERSIONS["torque"][self.torque_unit_var.get()]
+        return float(value) * self._torque_factor
+
+    # Convert a torque in Nm back to the selected torque unit for display (works on arrays too)
+    def torque_to_unit(self, value_nm):
+        return value_nm * self._inv_torque_factor
 
     # Open multi-select popup to connect gear i to multiple other gears
     def open_multiselect_popup(self, combo_var, idx):
-        popup = Toplevel(self.root)
-        popup.title(f"Select Connections for Gear {idx}")
-        popup.geometry("300x300")
-        tk.Label(popup, text="Select gears to connect:").pack(pady=5)
-
-        checks = []
-        check_vars = []
-        for i in range(len(self.gear_rows)):
-            if i != idx:
-                var = IntVar()
-                chk = Checkbutton(popup, text=f"Gear {i}", variable=var)
+        if self._popup is None:
+            self._build_multiselect_popup()
+        self._popup.title(f"Select Connections for Gear {idx}")
+        self._popup_target = (combo_var, idx)
+
+        # Grow the Checkbutton pool as gears are added, then show one per other gear
+        n = len(self.gear_rows)
+        while len(self._popup_checks) < n:
+            var = IntVar()
+            chk = Checkbutton(self._popup_check_frame, variable=var)
+            self._popup_checks.append((chk, var))
+        for i, (chk, var) in enumerate(self._popup_checks):
+            chk.pack_forget()
+            var.set(0)
+            if i < n and i != idx:
+                chk.config(text=f"Gear {i}")
                 chk.pack(anchor="w")
-                checks.append(chk)
-                check_vars.append((i, var))
-
-        def apply():
-            selected = [str(i) for i, var in check_vars if var.get()]
-            combo_var.set(",".join(selected))
-            popup.destroy()
 
-        tk.Button(popup, text="Apply", command=apply).pack(pady=10)
+        self._popup.deiconify()
+        self._popup.lift()
 
-    # Refresh the connection fields on each new gear row
-    def refresh_connection_dropdowns(self):
-        for i, row in enumerate(self.gear_rows):
-            row["connects"].unbind("<Button-1>")
-            row["connects"].bind("<Button-1>", lambda e, idx=i, var=row["conn_var"]: self.open_multiselect_popup(var, idx))
+    # Build the connections popup once; it is hidden rather than destroyed between uses
+    def _build_multiselect_popup(self):
+        popup = Toplevel(self.root)
+        popup.geometry("300x300")
+        popup.protocol("WM_DELETE_WINDOW", popup.withdraw)
+        tk.Label(popup, text="Select gears to connect:").pack(pady=5)
+        self._popup_check_frame = tk.Frame(popup)
+        self._popup_check_frame.pack(fill="x")
+        tk.Button(popup, text="Apply", command=self._apply_multiselect_popup).pack(pady=10)
+        self._popup = popup
+
+    def _apply_multiselect_popup(self):
+        combo_var, idx = self._popup_target
+        n = len(self.gear_rows)
+        selected = [str(i) for i, (chk, var) in enumerate(self._popup_checks[:n]) if i != idx and var.get()]
+        combo_var.set(",".join(selected))
+        self._popup.withdraw()
+
+    # Cache the "Connects To" text as a tuple of gear indices on the row
+    def _update_connects_list(self, row):
+        conn = row["conn_var"].get()
+        row["connects_list"] = tuple(int(c.strip()) for c in conn.split(',') if c.strip().isdecimal())
 
     # Add a new gear input row
     def add_gear_row(self):
@@ -157,7 +360,7 @@ class GearMatrixPro:
         gear_label = tk.Label(row_frame, text=f"Gear {idx}", width=12, bg="#111d40", fg="#ffffff")
         gear_label.grid(row=0, column=0, padx=2)
 
-        gear_type = ttk.Combobox(row_frame, values=list(VALID_TRANSITIONS.keys()), state="readonly", width=12)
+        gear_type = ttk.Combobox(row_frame, values=_GEAR_TYPES, state="readonly", width=12)
         gear_type.set("Spur")
         gear_type.grid(row=0, column=1, padx=2)
 
@@ -176,139 +379,249 @@ class GearMatrixPro:
         for widget in [gear_type, teeth_entry, radius_entry, conn_combo]:
             widget.bind("<Return>", lambda e, w=widget: w.tk_focusNext().focus())
 
-        self.gear_rows.append({
+        row = {
+            "idx": idx,
             "label": gear_label,
             "type": gear_type,
             "teeth": teeth_entry,
             "radius": radius_entry,
             "connects": conn_combo,
-            "conn_var": conn_var
-        })
+            "conn_var": conn_var,
+            "connects_list": ()
+        }
+        self.gear_rows.append(row)
+
+        # Parse the connections only when the field is written (popup Apply or typing)
+        conn_var.trace_add("write", lambda *args, r=row: self._update_connects_list(r))
+
+        # Bound once per row; the handler reads the row's own index at click time
+        conn_combo.bind("<Button-1>", lambda e, r=row: self.open_multiselect_popup(r["conn_var"], r["idx"]))
+
+    # Cache the static background after every full redraw and paint the animated lines on top
+    def _on_draw(self, event):
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_lines()
+
+    def _draw_lines(self):
+        for line in self.lines:
+            self.ax.draw_artist(line)
+        self.ax.draw_artist(self.ax.get_legend())
+        self.ax.draw_artist(self.annot)
+
+    # Drop the plotted lines and stop listening for mouse motion over the chart
+    def _clear_plot(self):
+        if self.canvas is None or not self.lines:
+            return
+        if self._hover_cid is not None:
+            self.canvas.mpl_disconnect(self._hover_cid)
+            self._hover_cid = None
+        self._hover_timer.stop()
+        self.lines = []
+        self._plot_sig = None
+        self._stages_np = self._rpms_np = self._torques_np = np.empty(0)
+        self.line1.set_data([], [])
+        self.line2.set_data([], [])
+        self._annot_state = (None, None, None)
+        self.annot.set_visible(False)
+        self.canvas.draw_idle()
 
-        self.refresh_connection_dropdowns()
+    # Restart the hover timer on each mouse move; the tooltip is updated when it fires
+    def hover(self, event):
+        self._last_event = event
+        self._hover_timer.stop()
+        self._hover_timer.start()
 
     # Tooltip display when hovering over the matplotlib chart
-    def hover(self, event):
+    def _do_hover(self):
+        event = self._last_event
         vis = self.annot.get_visible()
-        if event.inaxes == self.ax:
-            for line in self.lines:
-                cont, ind = line.contains(event)
-                if cont:
-                    x, y = line.get_data()
-                    index = ind["ind"][0]
-                    self.annot.xy = (x[index], y[index])
-                    self.annot.set_text(f"{line.get_label()}: {y[index]:.2f}")
-                    self.annot.set_visible(True)
-                    self.canvas.draw_idle()
-                    return
+        if event.inaxes == self.ax and event.xdata is not None:
+            # Both lines share integer gear-index x values, so snap to the nearest index
+            idx = int(round(event.xdata))
+            if 0 <= idx < len(self._stages_np):
+                x = self._stages_np[idx]
+                for line, ys in ((self.line1, self._rpms_np), (self.line2, self._torques_np)):
+                    px, py = self.ax.transData.transform((x, ys[idx]))
+                    if abs(px - event.x) <= self._hover_radius and abs(py - event.y) <= self._hover_radius:
+                        state = (x, ys[idx], line.get_label())
+                        if state == self._annot_state and vis:
+                            return
+                        self._annot_state = state
+                        self.annot.xy = (x, ys[idx])
+                        self.annot.set_text(f"{line.get_label()}: {ys[idx]:.2f}")
+                        self.annot.set_visible(True)
+                        self.canvas.draw_idle()
+                        return
         if vis:
             self.annot.set_visible(False)
             self.canvas.draw_idle()
 
     # Cycle detection for graph connections (avoids infinite loops)
     def has_cycle(self, graph):
-        visited = set()
-        rec_stack = set()
-        def visit(node):
-            visited.add(node)
-            rec_stack.add(node)
-            for neighbor in graph.get(node, []):
-                if neighbor not in visited:
-                    if visit(neighbor):
-                        return True
-                elif neighbor in rec_stack:
-                    return True
-            rec_stack.remove(node)
-            return False
-        for node in graph:
-            if node not in visited:
-                if visit(node):
+        # Iterative three-colour DFS: 0 = unvisited, 1 = on the current path, 2 = done
+        color = {node: 0 for node in graph}
+        for start in graph:
+            if color[start]:
+                continue
+            color[start] = 1
+            stack = [(start, iter(graph[start]))]
+            while stack:
+                node, nbrs = stack[-1]
+                nxt = next(nbrs, None)
+                if nxt is None:
+                    color[node] = 2
+                    stack.pop()
+                    continue
+                state = color.get(nxt, 0)
+                if state == 1:
                     return True
+                if state == 0:
+                    color[nxt] = 1
+                    stack.append((nxt, iter(graph.get(nxt, ()))))
         return False
 
+    # Update the RPM/Torque lines in place and only redraw the axes when the limits move
+    def _update_plot(self, stages, rpms, torques, torque_unit):
+        # Calculate may run before the deferred chart build; build it now in that case
+        if self.canvas is None:
+            self._build_chart()
+
+        # Nothing to redraw if the plotted data is unchanged since the last run
+        sig = (len(stages), rpms.tobytes(), torques.tobytes(), torque_unit)
+        if sig == self._plot_sig:
+            return
+        self._plot_sig = sig
+
+        # A tooltip left over from the old data would show stale text at a stale point
+        self.annot.set_visible(False)
+        self._annot_state = (None, None, None)
+
+        self.lines = [self.line1, self.line2]
+        self._stages_np = stages
+        self._rpms_np = rpms
+        self._torques_np = torques
+        if self._hover_cid is None:
+            self._hover_cid = self.canvas.mpl_connect("motion_notify_event", self.hover)
+        old_limits = (self.ax.get_xlim(), self.ax.get_ylim())
+        torque_label = f"Torque ({torque_unit})"
+        if self.line2.get_label() != torque_label:
+            self.line2.set_label(torque_label)
+            self.ax.legend().set_animated(True)
+        self.line1.set_data(stages, rpms)
+        self.line2.set_data(stages, torques)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        if self._bg is None or (self.ax.get_xlim(), self.ax.get_ylim()) != old_limits:
+            self.canvas.draw_idle()
+        else:
+            self.canvas.restore_region(self._bg)
+            self._draw_lines()
+            self.canvas.blit(self.ax.bbox)
+
     # Main RPM-Torque calculation and plotting
     def calculate(self):
         try:
             rpm = float(self.rpm_var.get())
             torque = self.convert_unit_torque(self.torque_var.get())
-            result = ""
+
+            # Parse all teeth/radius inputs at once and convert units in a single multiply
+            n = len(self.gear_rows)
+            teeth = np.fromiter((int(g["teeth"].get()) for g in self.gear_rows), dtype=np.int32, count=n)
+            radius = np.fromiter((float(g["radius"].get()) for g in self.gear_rows), dtype=np.float64, count=n) * self._length_factor
+            modules = np.divide(radius, teeth, out=np.zeros(n), where=teeth != 0)
 
             # Gear graph creation from inputs
-            graph = {}
-            gear_data = {}
-
-            for i, gear in enumerate(self.gear_rows):
-                t = int(gear["teeth"].get())
-                r = self.convert_unit_length(gear["radius"].get())
-                module = r / t if t else 0
-                conn = gear["connects"].get()
-                connects = [int(c.strip()) for c in conn.split(',') if c.strip().isdigit()]
-                graph[i] = connects
-                gear_data[i] = {"teeth": t, "radius": r, "rpm": None, "torque": None, "eff": None, "module": module}
+            graph = {i: gear["connects_list"] for i, gear in enumerate(self.gear_rows)}
 
             if self.has_cycle(graph):
                 raise ValueError("Cycle detected in gear connections. Remove circular references.")
 
+            # Structure-of-arrays gear state, indexed by gear id
+            self.gear_arrays = {
+                "teeth": teeth,
+                "radius": radius,
+                "rpm": np.full(n, np.nan),
+                "torque": np.full(n, np.nan),
+                "eff": np.full(n, np.nan),
+                "module": modules
+            }
+            rpms_arr = self.gear_arrays["rpm"]
+            torques_arr = self.gear_arrays["torque"]
+            effs_arr = self.gear_arrays["eff"]
+            reached = np.zeros(n, dtype=bool)
+
             # Initialize gear 0 as input
-            gear_data[0]["rpm"] = rpm
-            gear_data[0]["torque"] = torque
-            visited = set()
-            result_list = []
-
-            # DFS to traverse connected gears and propagate RPM/Torque
-            def dfs(node):
-                visited.add(node)
-                for nbr in graph.get(node, []):
-                    if nbr in visited: continue
-                    t1 = gear_data[node]["teeth"]
-                    t2 = gear_data[nbr]["teeth"]
-                    r1 = gear_data[node]["radius"]
-                    r2 = gear_data[nbr]["radius"]
-                    radius_ratio = r2 / r1 if r1 else 1
-                    rpm_n = gear_data[node]["rpm"] * radius_ratio
-                    torque_n = gear_data[node]["torque"] / radius_ratio
-                    input_power = gear_data[node]["torque"] * gear_data[node]["rpm"]
-                    output_power = torque_n * rpm_n
-                    eff = output_power / input_power if input_power else 1
-                    gear_data[nbr]["rpm"] = rpm_n
-                    gear_data[nbr]["torque"] = torque_n
-                    gear_data[nbr]["eff"] = eff
-                    result_list.append(f"Gear {node} → Gear {nbr}: Ratio {t2/t1:.2f}, RPM {rpm_n:.2f}, Torque {torque_n:.2f}, Efficiency: {eff*100:.2f}%")
-                    dfs(nbr)
-
-            dfs(0)
-
-            # Format output text
-            result += "\n".join(result_list)
-            last_gear = max((k for k, v in gear_data.items() if v['rpm'] is not None), default=0)
-            result += f"\n\n★ Final Gear {last_gear}:\n    RPM: {gear_data[last_gear]['rpm']:.2f} RPM\n    Torque: {gear_data[last_gear]['torque']:.2f} Nm"
-            result += "\n\n★ Module Calculations:"
-            for i in gear_data:
-                result += f"\n    Gear {i}: Module = {gear_data[i]['module']:.2f} {self.unit_var.get()}"
-            self.result_label.config(text=result)
-
-            # Plot graph
-            self.ax.clear()
-            self.ax.set_facecolor("#111111")
-            stages = list(gear_data.keys())
-            rpms = [gear_data[i]['rpm'] or 0 for i in stages]
-            torques = [gear_data[i]['torque'] or 0 for i in stages]
-            line1, = self.ax.plot(stages, rpms, marker='o', label='RPM', color='cyan')
-            line2, = self.ax.plot(stages, torques, marker='s', label='Torque (Nm)', color='magenta')
-            self.lines = [line1, line2]
-
-            self.ax.set_title('Gearwise RPM & Torque')
-            self.ax.set_xlabel('Gear Index')
-            self.ax.set_ylabel('Values')
-            self.ax.grid(True, color="#333333")
-            self.ax.tick_params(colors="white")
-            self.ax.xaxis.label.set_color("white")
-            self.ax.yaxis.label.set_color("white")
-            self.ax.title.set_color("white")
-            self.ax.legend()
-            self.canvas.draw()
+            rpms_arr[0] = rpm
+            torques_arr[0] = torque
+            reached[0] = True
+
+            if all(graph[i] == (i + 1,) for i in range(n - 1)) and not graph[n - 1]:
+                # Simple chain 0 → 1 → ... → n-1: propagate every stage at once
+                result_list = []
+                if n > 1:
+                    if not teeth[:-1].all():
+                        raise ZeroDivisionError("division by zero")
+                    ratios = np.divide(radius[1:], radius[:-1], out=np.ones(n - 1), where=radius[:-1] != 0)
+                    if not ratios.all():
+                        raise ZeroDivisionError("float division by zero")
+                    cum_ratios = np.cumprod(ratios)
+                    rpms_arr[1:] = rpm * cum_ratios
+                    torques_arr[1:] = torque / cum_ratios
+                    power = torques_arr * rpms_arr
+                    effs_arr[1:] = np.divide(power[1:], power[:-1], out=np.ones(n - 1), where=power[:-1] != 0)
+                    reached[:] = True
+                    teeth_ratios = teeth[1:] / teeth[:-1]
+                    result_list = [
+                        f"Gear {i} → Gear {i + 1}: Ratio {ratio:.2f}, RPM {rpm_n:.2f}, Torque {torque_n:.2f}, Efficiency: {eff*100:.2f}%"
+                        for i, (ratio, rpm_n, torque_n, eff) in enumerate(zip(teeth_ratios.tolist(), rpms_arr[1:].tolist(), self.torque_to_unit(torques_arr[1:]).tolist(), effs_arr[1:].tolist()))
+                    ]
+            else:
+                # CSR adjacency for the propagation kernel
+                indptr = np.zeros(n + 1, dtype=np.int32)
+                indptr[1:] = np.cumsum([len(graph[i]) for i in range(n)])
+                indices = np.fromiter((j for i in range(n) for j in graph[i]), dtype=np.int32, count=int(indptr[-1]))
+
+                edge_from = np.empty(n, dtype=np.int32)
+                edge_to = np.empty(n, dtype=np.int32)
+                m = _run_propagate(indptr, indices, radius, rpms_arr, torques_arr, effs_arr, reached, edge_from, edge_to)
+
+                # Format from Python lists; indexing the arrays per edge is much slower
+                teeth_list = teeth.tolist()
+                rpms_list = rpms_arr.tolist()
+                torques_list = self.torque_to_unit(torques_arr).tolist()
+                effs_list = effs_arr.tolist()
+                result_list = [
+                    f"Gear {node} → Gear {nbr}: Ratio {teeth_list[nbr]/teeth_list[node]:.2f}, RPM {rpms_list[nbr]:.2f}, Torque {torques_list[nbr]:.2f}, Efficiency: {effs_list[nbr]*100:.2f}%"
+                    for node, nbr in zip(edge_from[:m].tolist(), edge_to[:m].tolist())
+                ]
+
+            # Torques are propagated in Nm and shown in the selected torque unit
+            torques_disp = self.torque_to_unit(torques_arr)
+            torque_unit = self.torque_unit_var.get()
+
+            # Format output text (collected as parts and joined once)
+            last_gear = int(np.flatnonzero(reached)[-1])
+            unit = self.unit_var.get()
+            parts = ["\n".join(result_list), ""]
+            parts.append(f"★ Final Gear {last_gear}:\n    RPM: {rpms_arr[last_gear]:.2f} RPM\n    Torque: {torques_disp[last_gear]:.2f} {torque_unit}")
+            parts.append("")
+            parts.append("★ Module Calculations:")
+            parts.extend(f"    Gear {i}: Module = {m:.2f} {unit}" for i, m in enumerate(modules.tolist()))
+            result = "\n".join(parts)
+
+            # Plot graph (gears not reached from gear 0 are shown as 0)
+            stages = np.arange(n)
+            rpms = np.where(reached, rpms_arr, 0.0)
+            torques = np.where(reached, torques_disp, 0.0)
+
+            if self.result_label.cget("text") != result:
+                self.result_label.config(text=result)
+            self._update_plot(stages, rpms, torques, torque_unit)
 
         except Exception as e:
+            # Don't leave results or a chart from earlier inputs up (or hover connected) after a failed run
+            self.result_label.config(text="Results will appear here...")
+            self._clear_plot()
             messagebox.showerror("Error", f"Input error: {e}")
 
 # Run the app